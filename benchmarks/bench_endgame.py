@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark the endgame solver on a few sample positions.
+
+The client has no dictionary, so a small word list stands in for one:
+words are laid across the first empty row, which is enough to exercise
+the search, move ordering and transposition table.
+
+Usage: python benchmarks/bench_endgame.py [time_budget]
+"""
+
+import os
+import sys
+
+# Run from a checkout without installing the package; the stand-in move
+# generator is shared with the tests
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "tests")]
+
+from wordfeud_api.endgame import EndgamePosition, EndgameSolver
+from wordfeud_api.move import BLANK
+
+from helpers import TILE_VALUES, WordListMoves
+
+WORDS = [
+    "AT", "TA", "AN", "NA", "IN", "IT", "TI", "TO", "ON", "NO", "OR", "RE", "ER",
+    "ES", "SO", "OX", "AX", "XI", "QI", "ZA", "JO", "EN", "NE", "OE",
+    "ANT", "TAN", "NIT", "TIN", "TON", "NOT", "ORE", "ROE", "SIT", "ITS", "SET",
+    "ZAS", "JOT", "QIS", "TAX", "SEX", "NOR", "RAN", "RAT", "ART", "TAR",
+    "RANT", "TERN", "RENT", "NOTE", "TONE", "STAR", "RATS", "ARTS", "JOTS",
+    "ZERO", "TAXI", "RAIN", "STAIR", "TRAIN", "SATIN", "STONE", "ONSET",
+    "NOTES", "TRAINS", "STRAIN",
+]
+
+word_moves = WordListMoves(WORDS)
+
+POSITIONS = [
+    ("short", "ZAQS", "TOXE"),
+    ("medium", "RANTSE", "JOTIQ" + BLANK),
+    ("long", "STRAINE", "ZOTEX" + BLANK + "N"),
+]
+
+
+def main():
+    time_budget = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+
+    print("%-8s %6s %6s %6s %10s %9s" % ("position", "spread", "depth", "exact", "nodes", "seconds"))
+    for name, rack0, rack1 in POSITIONS:
+        position = EndgamePosition({}, [list(rack0), list(rack1)], 0, TILE_VALUES)
+        solver = EndgameSolver(word_moves, time_budget=time_budget)
+        result = solver.solve(position)
+        print("%-8s %6s %6s %6s %10d %9.3f" % (name, result.spread, result.depth,
+                                                result.exact, result.nodes, result.elapsed))
+        print("         %r" % result.moves)
+
+
+if __name__ == "__main__":
+    main()
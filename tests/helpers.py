@@ -0,0 +1,57 @@
+"""
+Shared helpers for the tests and benchmarks: a tiny stand-in for a real
+move generator.
+"""
+
+from collections import Counter
+
+from wordfeud_api.move import BLANK, Move
+from wordfeud_api.tiles import tile_values
+from wordfeud_api.wordfeud import Wordfeud
+
+TILE_VALUES = tile_values(Wordfeud.RuleSetEnglish)
+
+WORDS = [
+    "AT", "TA", "AN", "NA", "IN", "IT", "TO", "ON", "NO", "OE", "ES", "SO",
+    "OX", "AX", "ZA", "QI", "EN", "NE", "AS", "TOE", "SAN", "ANT", "TAN",
+    "NOT", "TON", "SET", "ZAS", "TAX", "NOTE", "TONE", "ANTS",
+]
+
+
+#
+# Move generator for a fixed word list: each word that can be made from
+# the rack is laid across the first empty row. Later rows score more, so
+# the order of moves matters. Instances can be sent to worker processes.
+#
+class WordListMoves:
+
+    def __init__(self, words):
+        self.words = list(words)
+
+    def __call__(self, board, rack):
+        rows = {y for (_, y) in board}
+        row = next(y for y in range(15) if y not in rows)
+        bonus = 1 + len(rows) % 3
+        counts = Counter(rack)
+
+        moves = []
+        for word in self.words:
+            need = Counter(word)
+            missing = sum(max(0, n - counts[letter]) for letter, n in need.items())
+            if missing > counts[BLANK]:
+                continue
+            available = Counter(counts)
+            tiles = []
+            points = 0
+            for x, letter in enumerate(word):
+                if available[letter] > 0:
+                    available[letter] -= 1
+                    tiles.append((x, row, letter, False))
+                    points += TILE_VALUES[letter]
+                else:
+                    tiles.append((x, row, letter, True))
+            moves.append(Move(tiles, word, points * bonus))
+        return moves
+
+
+word_moves = WordListMoves(WORDS)
@@ -0,0 +1,140 @@
+import time
+
+import pytest
+
+from wordfeud_api.endgame import EndgamePosition, EndgameSolver, _ZobristKeys
+from wordfeud_api.move import Move
+
+from helpers import TILE_VALUES, word_moves
+
+POSITIONS = [
+    ("TOE", "SAN"),
+    ("ZAQS", "TOXE"),
+    ("NOTE", "AS"),
+    ("ANTS", "OX?"),
+]
+
+
+def make_position(rack0, rack1):
+    return EndgamePosition({}, [list(rack0), list(rack1)], 0, TILE_VALUES)
+
+
+def minimax(position):
+    best = None
+    for move in word_moves(position.board, tuple(position.racks[position.to_move])) + [Move()]:
+        points = position.play(move)
+        if position.is_over():
+            value = points + position.end_bonus()
+        else:
+            value = points - minimax(position)
+        position.undo(move)
+        if best is None or value > best:
+            best = value
+    return best
+
+
+def brute_force(rack0, rack1):
+    position = make_position(rack0, rack1)
+    position.attach_keys(_ZobristKeys())
+    return minimax(position)
+
+
+@pytest.mark.parametrize("rack0,rack1", POSITIONS)
+def test_solve_matches_minimax(rack0, rack1):
+    result = EndgameSolver(word_moves).solve(make_position(rack0, rack1))
+
+    assert result.exact
+    assert result.spread == brute_force(rack0, rack1)
+
+
+@pytest.mark.parametrize("rack0,rack1", POSITIONS)
+def test_reused_solver_matches_minimax(rack0, rack1):
+    solver = EndgameSolver(word_moves)
+    position = make_position(rack0, rack1)
+
+    shallow = solver.solve(position, max_depth=2)
+    assert not shallow.exact or shallow.spread == brute_force(rack0, rack1)
+
+    result = solver.solve(position)
+    assert result.exact
+    assert result.spread == brute_force(rack0, rack1)
+
+
+def test_play_and_undo_restore_the_position():
+    position = make_position("TOE", "SAN")
+    position.attach_keys(_ZobristKeys())
+    start = (position.hash, dict(position.board), [sorted(r) for r in position.racks])
+
+    moves = []
+    for _ in range(3):
+        move = (word_moves(position.board, tuple(position.racks[position.to_move])) + [Move()])[0]
+        position.play(move)
+        moves.append(move)
+    for move in reversed(moves):
+        position.undo(move)
+
+    assert (position.hash, position.board, [sorted(r) for r in position.racks]) == start
+
+
+def test_principal_variation_adds_up_to_spread():
+    position = make_position("NOTE", "AS")
+    position.attach_keys(_ZobristKeys())
+    result = EndgameSolver(word_moves).solve(position)
+
+    spread = 0
+    sign = 1
+    for move in result.moves:
+        spread += sign * position.play(move)
+        sign = -sign
+    assert position.is_over()
+    assert spread - sign * position.end_bonus() == result.spread
+
+
+#
+# One tile at a time along the first row; the Q never fits
+#
+def single_tile_moves(board, rack):
+    x = len(board)
+    bonus = 1 + x % 3
+    return [Move([(x, 0, letter, False)], letter, TILE_VALUES[letter] * bonus)
+            for letter in sorted(set(rack)) if letter != "Q"]
+
+
+def solved_minimax(position, memo):
+    value = memo.get(position.hash)
+    if value is None:
+        for move in single_tile_moves(position.board, position.racks[position.to_move]) + [Move()]:
+            points = position.play(move)
+            if position.is_over():
+                result = points + position.end_bonus()
+            else:
+                result = points - solved_minimax(position, memo)
+            position.undo(move)
+            if value is None or result > value:
+                value = result
+        memo[position.hash] = value
+    return value
+
+
+def test_long_lines_with_passes_are_solved():
+    # The opponent can only pass while we play out one tile at a time
+    position = make_position("AANNTTS", "Q")
+    position.attach_keys(_ZobristKeys())
+    expected = solved_minimax(position, {})
+
+    result = EndgameSolver(single_tile_moves, time_budget=60).solve(position)
+
+    assert result.exact
+    assert result.spread == expected
+    assert result.depth > len("AANNTTS") + len("Q") + position.MaxPasses
+
+
+def test_time_budget_is_checked_at_every_node():
+    def slow_moves(board, rack):
+        time.sleep(0.005)
+        return single_tile_moves(board, rack)
+
+    start = time.monotonic()
+    EndgameSolver(slow_moves, time_budget=0.3).solve(make_position("AANNTTS", "Q"))
+
+    assert time.monotonic() - start < 0.6
@@ -0,0 +1,69 @@
+import pytest
+
+from wordfeud_api.replay import GameReplay, replay_games
+from wordfeud_api.wordfeud import WordfeudException
+
+GAME = {
+    "id": 1,
+    "players": [{"id": 10, "position": 0}, {"id": 20, "position": 1}],
+    "moves": [
+        {"move_type": "move", "user_id": 10, "points": 8, "main_word": "CAT",
+         "move": [[7, 7, "C", False], [8, 7, "A", False], [9, 7, "T", True]]},
+        {"move_type": "pass", "user_id": 20, "points": 0},
+        {"move_type": "move", "user_id": 20, "points": 5, "main_word": "CO",
+         "move": [[7, 8, "O", False]]},
+        {"move_type": "swap", "user_id": 10, "points": 0, "tile_count": 3},
+    ],
+}
+
+
+def final_points(replay):
+    return replay.scores(len(replay))
+
+
+def test_board_at_every_ply():
+    replay = GameReplay(GAME)
+    cat = {(7, 7): ("C", False), (8, 7): ("A", False), (9, 7): ("T", True)}
+
+    assert len(replay) == 4
+    assert dict(replay.board(0)) == {}
+    assert dict(replay.board(1)) == cat
+    assert dict(replay.board(2)) == cat
+    final = dict(cat)
+    final[(7, 8)] = ("O", False)
+    assert dict(replay.board(3)) == final == dict(replay.board(4))
+
+    board = replay.board(2)
+    assert len(board) == 3
+    assert (7, 8) not in board
+    with pytest.raises(KeyError):
+        board[(7, 8)]
+    with pytest.raises(IndexError):
+        replay.board(5)
+
+
+def test_scores_and_plies():
+    replay = GameReplay(GAME)
+
+    assert [replay.scores(k) for k in range(5)] == [(0, 0), (8, 0), (8, 0), (8, 5), (8, 5)]
+    assert [(ply.player, ply.move_type) for ply in replay] == [
+        (0, "move"), (1, "pass"), (1, "move"), (0, "swap")]
+    assert replay.plies[0].rack_letters() == ["C", "A", "?"]
+    assert replay.plies[1].move.is_pass()
+
+
+def test_rejects_inconsistent_history():
+    with pytest.raises(WordfeudException):
+        GameReplay({"players": []})
+
+    game = dict(GAME, moves=GAME["moves"] + [
+        {"move_type": "move", "user_id": 20, "points": 2, "move": [[7, 7, "X", False]]}])
+    with pytest.raises(WordfeudException):
+        GameReplay(game)
+
+
+def test_replay_games_takes_a_generator():
+    games = (GAME for _ in range(20))
+
+    assert replay_games(games, final_points, workers=2) == [(8, 5)] * 20
+    assert replay_games([GAME], workers=1)[0].scores(1) == (8, 0)
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from wordfeud_api.move import Move
+from wordfeud_api.simulation import MonteCarloSimulator
+from wordfeud_api.wordfeud import WordfeudException
+
+from helpers import TILE_VALUES, word_moves
+
+RACK = list("TOESANX")
+UNSEEN = list("ZAQSTOXEINNOTEASIT")
+
+
+def slow_moves(board, rack):
+    time.sleep(0.05)
+    return word_moves(board, rack)
+
+
+def candidates():
+    return word_moves({}, tuple(RACK))[:4] + [Move()]
+
+
+def simulate(workers, **options):
+    with MonteCarloSimulator(word_moves, TILE_VALUES, plies=2, time_budget=60,
+                             max_iterations=30, workers=workers, seed=7, **options) as sim:
+        return [(r.move, r.iterations, r.mean_spread) for r in sim.simulate({}, RACK, candidates(), UNSEEN)]
+
+
+def test_same_results_in_process_and_on_pool():
+    expected = simulate(1)
+
+    assert [iterations for _, iterations, _ in expected] == [30] * 5
+    assert simulate(3) == expected
+    assert simulate(2, batch_size=7) == expected
+
+
+def test_candidates_face_the_same_racks():
+    move = candidates()[0]
+    twin = Move(move.tiles, move.words, move.points)
+
+    with MonteCarloSimulator(word_moves, TILE_VALUES, max_iterations=20, workers=1) as sim:
+        first, second = sim.simulate({}, RACK, [move, twin], UNSEEN)
+
+    assert first.mean_spread == second.mean_spread
+    assert first.stdev == second.stdev
+
+
+def test_time_budget_is_kept_across_decisions():
+    with MonteCarloSimulator(slow_moves, TILE_VALUES, time_budget=0.5,
+                             max_iterations=1000, workers=2) as sim:
+        for _ in range(2):
+            start = time.monotonic()
+            results = sim.simulate({}, RACK, candidates()[:1], UNSEEN)
+            assert time.monotonic() - start < 1.5
+            assert results[0].iterations > 0
+
+
+def test_raises_when_no_playout_finishes():
+    with MonteCarloSimulator(slow_moves, TILE_VALUES, time_budget=0.01, workers=1) as sim:
+        with pytest.raises(WordfeudException):
+            sim.simulate({}, RACK, candidates(), UNSEEN)
@@ -0,0 +1,78 @@
+import pytest
+
+from wordfeud_api.tiles import TILE_SETS, UnseenTiles, tile_distribution, tile_values
+from wordfeud_api.wordfeud import Wordfeud, WordfeudException
+
+
+def make_game(tiles, rack):
+    return {
+        "ruleset": Wordfeud.RuleSetEnglish,
+        "tiles": tiles,
+        "players": [{"id": 1, "position": 0, "rack": rack}, {"id": 2, "position": 1}],
+    }
+
+
+def test_every_rule_set_has_tables():
+    for ruleset in TILE_SETS:
+        assert tile_distribution(ruleset).keys() == tile_values(ruleset).keys()
+    assert sum(tile_distribution(Wordfeud.RuleSetEnglish).values()) == 104
+
+    with pytest.raises(WordfeudException):
+        tile_distribution(42)
+
+
+def test_draw_probability_matches_hypergeometric():
+    # Two A's and three B's, drawing two: C(5, 2) = 10 possible draws
+    unseen = UnseenTiles(distribution={"A": 2, "B": 3})
+
+    assert unseen.letter_probabilities(2)["A"] == pytest.approx(1 - 3 / 10)
+    assert unseen.draw_probability("AB", 2) == pytest.approx(2 * 3 / 10)
+    assert unseen.draw_probability("AA", 2) == pytest.approx(1 / 10)
+    assert unseen.draw_probability("AAB", 2) == 0
+    assert unseen.draw_probability("AB", 10) == 1
+
+
+def test_probabilities_follow_the_unseen_tiles():
+    unseen = UnseenTiles(distribution={"A": 2, "B": 3})
+    assert unseen.draw_probability("A", 1) == pytest.approx(2 / 5)
+
+    unseen.set_rack(["A"])
+    assert unseen.draw_probability("A", 1) == pytest.approx(1 / 4)
+
+
+def test_update_game_counts_only_new_tiles():
+    game = make_game([[7, 7, "C", False], [8, 7, "A", False], [9, 7, "T", True]], ["E", "E", "S", ""])
+    unseen = UnseenTiles.from_game(game)
+
+    assert len(unseen) == 104 - 3 - 4
+    assert unseen.count("?") == 0
+    assert unseen.count("E") == 10
+
+    # The opponent plays O; we play S and draw a Q
+    game["tiles"].append([7, 8, "O", False])
+    game["tiles"].append([10, 7, "S", False])
+    game["players"][0]["rack"] = ["E", "E", "?", "Q"]
+    unseen.update_game(game)
+
+    assert len(unseen) == 104 - 5 - 4
+    assert unseen.count("O") == 6
+    assert unseen.count("S") == 4
+    assert unseen.count("Q") == 0
+
+    unseen.update_game(game)
+    assert len(unseen) == 104 - 5 - 4
+
+
+def test_place_from_rack():
+    unseen = UnseenTiles(Wordfeud.RuleSetEnglish)
+    unseen.set_rack(["Z", "A"])
+    unseen.place([(7, 7, "K", False), (8, 7, "E", True)])
+    assert len(unseen) == 104 - 4
+
+    with pytest.raises(WordfeudException):
+        unseen.place([(7, 7, "A", False)], from_rack=True)
+
+    unseen.place([(7, 8, "A", False)], from_rack=True)
+    unseen.draw(["X"])
+    assert unseen.rack == ["Z", "X"]
+    assert len(unseen) == 104 - 5
@@ -12,6 +12,11 @@ from .wordfeud import (
     WordfeudHttpException,
     WordfeudJsonException
 )
+from .move import Move
+from .endgame import EndgamePosition, EndgameResult, EndgameSolver
+from .simulation import MonteCarloSimulator, SimulationResult
+from .tiles import UnseenTiles, tile_distribution, tile_values
+from .replay import BoardSnapshot, GameReplay, ReplayPly, replay_games
 
 __version__ = "0.2.0"
 __author__ = "mallpunk"
@@ -23,5 +28,18 @@ __all__ = [
     "WordfeudLogInException",
     "WordfeudClientException",
     "WordfeudHttpException",
-    "WordfeudJsonException"
+    "WordfeudJsonException",
+    "Move",
+    "EndgamePosition",
+    "EndgameResult",
+    "EndgameSolver",
+    "MonteCarloSimulator",
+    "SimulationResult",
+    "UnseenTiles",
+    "tile_distribution",
+    "tile_values",
+    "BoardSnapshot",
+    "GameReplay",
+    "ReplayPly",
+    "replay_games",
 ] 
\ No newline at end of file
@@ -0,0 +1,378 @@
+import random
+import time
+
+from .move import Move, board_from_tiles, normalize_rack, rack_value, own_player
+from .tiles import UnseenTiles, tile_values as ruleset_tile_values
+from .wordfeud import WordfeudException
+
+# Transposition table entry flags
+_EXACT = 0
+_LOWER = 1
+_UPPER = 2
+
+_INFINITY = float("inf")
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+#
+# Random 64-bit keys for Zobrist hashing, generated on first use
+#
+class _ZobristKeys:
+
+    def __init__(self, seed=0):
+        self._random = random.Random(seed)
+        self._keys = {}
+        self.side = self._random.getrandbits(64)
+
+    def get(self, *feature):
+        key = self._keys.get(feature)
+        if key is None:
+            key = self._keys[feature] = self._random.getrandbits(64)
+        return key
+
+
+#
+# A position once the bag is empty: the board, both racks and whose turn it is.
+#
+# Positions are changed in place with play() and undo(), and keep their
+# Zobrist hash up to date as they go.
+#
+class EndgamePosition:
+
+    # Number of scoreless turns in a row that ends the game
+    MaxPasses = 4
+
+    #
+    # @param dict board Mapping (x, y) => (letter, is_wildcard)
+    # @param array racks The racks of player 0 and player 1
+    # @param int to_move Player to move (0 or 1)
+    # @param dict tile_values Mapping letter => value
+    # @param int passes Scoreless turns played in a row so far
+    #
+    def __init__(self, board, racks, to_move, tile_values, passes=0):
+        self.board = dict(board)
+        self.racks = [list(racks[0]), list(racks[1])]
+        self.to_move = to_move
+        self.tile_values = tile_values
+        self.passes = passes
+        self.hash = 0
+        self._keys = None
+        self._history = []
+
+    #
+    # Create a position from a get_game() payload. The payload only holds
+    # your own rack; once the bag is empty the opponent holds exactly the
+    # unseen tiles, which is what opponent_rack defaults to.
+    #
+    # @param array game get_game() payload
+    # @param array opponent_rack Letters on the opponent's rack
+    # @param dict tile_values Mapping letter => value, defaults to those of the game's rule set
+    # @return EndgamePosition
+    # @throws WordfeudException If there are still tiles in the bag
+    #
+    @classmethod
+    def from_game(cls, game, opponent_rack=None, tile_values=None):
+        if game.get("bag_count", 0):
+            raise WordfeudException("bag_not_empty")
+        if opponent_rack is None:
+            opponent_rack = UnseenTiles.from_game(game).letters()
+        if tile_values is None:
+            tile_values = ruleset_tile_values(game["ruleset"])
+
+        me = own_player(game)
+        racks = [None, None]
+        racks[me["position"]] = normalize_rack(me["rack"])
+        racks[1 - me["position"]] = normalize_rack(opponent_rack)
+
+        return cls(board_from_tiles(game.get("tiles", [])), racks,
+                   game["current_player"], tile_values)
+
+    #
+    # Compute the hash of the current position from scratch
+    #
+    # @param _ZobristKeys keys
+    #
+    def attach_keys(self, keys):
+        self._keys = keys
+        h = 0
+        for (x, y), (letter, wild) in self.board.items():
+            h ^= keys.get("square", x, y, letter, wild)
+        for player, rack in enumerate(self.racks):
+            for letter in set(rack):
+                for n in range(1, rack.count(letter) + 1):
+                    h ^= keys.get("rack", player, letter, n)
+        if self.to_move:
+            h ^= keys.side
+        h ^= keys.get("passes", self.passes)
+        self.hash = h
+
+    def rack_value(self, player):
+        return rack_value(self.racks[player], self.tile_values)
+
+    def is_over(self):
+        return not self.racks[0] or not self.racks[1] or self.passes >= self.MaxPasses
+
+    #
+    # Play a move for the side to move.
+    #
+    # @param Move move
+    # @return int Points scored
+    #
+    def play(self, move):
+        keys = self._keys
+        player = self.to_move
+        rack = self.racks[player]
+        h = self.hash ^ keys.get("passes", self.passes)
+
+        for tile, letter in zip(move.tiles, move.rack_letters()):
+            x, y, board_letter, wild = tile
+            self.board[(x, y)] = (board_letter, bool(wild))
+            h ^= keys.get("square", x, y, board_letter, bool(wild))
+            h ^= keys.get("rack", player, letter, rack.count(letter))
+            rack.remove(letter)
+
+        self._history.append(self.passes)
+        self.passes = self.passes + 1 if move.is_pass() else 0
+        self.to_move = 1 - player
+        self.hash = h ^ keys.get("passes", self.passes) ^ keys.side
+        return move.points
+
+    #
+    # Take back a move made with play()
+    #
+    # @param Move move
+    #
+    def undo(self, move):
+        keys = self._keys
+        player = 1 - self.to_move
+        rack = self.racks[player]
+        h = self.hash ^ keys.get("passes", self.passes) ^ keys.side
+
+        for tile, letter in zip(move.tiles, move.rack_letters()):
+            x, y, board_letter, wild = tile
+            del self.board[(x, y)]
+            h ^= keys.get("square", x, y, board_letter, bool(wild))
+            rack.append(letter)
+            h ^= keys.get("rack", player, letter, rack.count(letter))
+
+        self.passes = self._history.pop()
+        self.to_move = player
+        self.hash = h ^ keys.get("passes", self.passes)
+
+    #
+    # Rack adjustment once the game is over, seen from the player who made
+    # the last move. Going out earns twice the opponent's rack; a game
+    # ended by passing costs each player their own rack.
+    #
+    # @return int
+    #
+    def end_bonus(self):
+        mover = 1 - self.to_move
+        if not self.racks[mover]:
+            return 2 * self.rack_value(self.to_move)
+        return self.rack_value(self.to_move) - self.rack_value(mover)
+
+
+#
+# Outcome of EndgameSolver.solve()
+#
+class EndgameResult:
+
+    def __init__(self, moves, spread, depth, exact, nodes, elapsed):
+        # Principal variation, starting with the move to play now
+        self.moves = moves
+        # Final spread gained by the side to move (its points minus the opponent's)
+        self.spread = spread
+        self.depth = depth
+        # True if the search reached the end of every line
+        self.exact = exact
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return "EndgameResult(spread=%s, depth=%s, exact=%s, moves=%r)" % (
+            self.spread, self.depth, self.exact, self.moves)
+
+    @property
+    def best_move(self):
+        return self.moves[0] if self.moves else Move()
+
+
+#
+# Exact endgame solver for positions where the bag is empty.
+#
+# Runs an alpha-beta search with iterative deepening until the game is
+# solved to the end or the time budget is spent. Positions are cached in a
+# Zobrist-hashed transposition table, which also provides the first move to
+# try at each node; the remaining moves are tried going-out first, then by
+# points.
+#
+# The client has no dictionary, so moves come from a move generator: a
+# callable taking (board, rack) and returning the legal Move objects for
+# that rack. Passing is always added by the solver. The generator must not
+# change the board or rack it is given.
+#
+class EndgameSolver:
+
+    #
+    # @param callable move_generator Returns the moves for (board, rack)
+    # @param float time_budget Seconds to search before returning the best line so far
+    # @param int max_table_size Transposition table entries kept before it is cleared
+    # @param int seed Seed for the Zobrist keys
+    #
+    def __init__(self, move_generator, time_budget=5.0, max_table_size=1000000, seed=0):
+        self.move_generator = move_generator
+        self.time_budget = time_budget
+        self.max_table_size = max_table_size
+        self._keys = _ZobristKeys(seed)
+        self._table = {}
+        self._nodes = 0
+        self._deadline = None
+        self._depth_cutoff = False
+
+    #
+    # Find the best line of play for the side to move.
+    #
+    # @param EndgamePosition position
+    # @param int max_depth Maximum number of plies to search, defaults to the longest possible game
+    # @return EndgameResult
+    #
+    def solve(self, position, max_depth=None):
+        start = time.monotonic()
+        self._deadline = start + self.time_budget
+        self._nodes = 0
+        position.attach_keys(self._keys)
+
+        if max_depth is None:
+            # Longest possible game: each tile played alone after a run of
+            # passes one short of ending the game, then a final run of passes
+            tiles = len(position.racks[0]) + len(position.racks[1])
+            max_depth = (tiles + 1) * position.MaxPasses
+
+        result = None
+        for depth in range(1, max_depth + 1):
+            self._depth_cutoff = False
+            try:
+                spread = self._search(position, depth, -_INFINITY, _INFINITY)
+            except _SearchTimeout:
+                break
+            exact = not self._depth_cutoff
+            result = EndgameResult(self._principal_variation(position, depth), spread,
+                                   depth, exact, self._nodes, time.monotonic() - start)
+            if exact:
+                break
+
+        if result is None:
+            moves = self._ordered_moves(position, None)
+            result = EndgameResult(moves[:1], None, 0, False, self._nodes,
+                                   time.monotonic() - start)
+        else:
+            result.nodes = self._nodes
+            result.elapsed = time.monotonic() - start
+        return result
+
+    def clear(self):
+        self._table.clear()
+
+    def _search(self, position, depth, alpha, beta):
+        self._nodes += 1
+        # Every node calls the move generator, so reading the clock is cheap in comparison
+        if time.monotonic() > self._deadline:
+            raise _SearchTimeout()
+
+        alpha_orig = alpha
+        tt_key = None
+        # Set when this node relies on a value that stopped at the depth limit
+        depth_limited = False
+        entry = self._table.get(position.hash)
+        if entry is not None:
+            entry_depth, entry_value, entry_flag, tt_key, entry_solved = entry
+            # Entries solved to the end of the game hold at any depth
+            if entry_solved or entry_depth >= depth:
+                depth_limited = not entry_solved
+                if entry_flag == _EXACT:
+                    self._depth_cutoff |= depth_limited
+                    return entry_value
+                if entry_flag == _LOWER:
+                    alpha = max(alpha, entry_value)
+                else:
+                    beta = min(beta, entry_value)
+                if alpha >= beta:
+                    self._depth_cutoff |= depth_limited
+                    return entry_value
+
+        if depth == 0:
+            self._depth_cutoff = True
+            return position.rack_value(1 - position.to_move) - position.rack_value(position.to_move)
+
+        outer_cutoff = self._depth_cutoff
+        self._depth_cutoff = depth_limited
+        best_value = -_INFINITY
+        best_key = None
+        for move in self._ordered_moves(position, tt_key):
+            points = position.play(move)
+            if position.is_over():
+                value = points + position.end_bonus()
+            else:
+                value = points - self._search(position, depth - 1, -beta, -alpha)
+            position.undo(move)
+
+            if value > best_value:
+                best_value = value
+                best_key = move.key()
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        if best_value <= alpha_orig:
+            flag = _UPPER
+        elif best_value >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+
+        solved = not self._depth_cutoff
+        self._depth_cutoff = outer_cutoff or not solved
+
+        if len(self._table) >= self.max_table_size:
+            self._table.clear()
+        self._table[position.hash] = (depth, best_value, flag, best_key, solved)
+        return best_value
+
+    def _ordered_moves(self, position, tt_key):
+        rack = position.racks[position.to_move]
+        rack_size = len(rack)
+        moves = [move for move in self.move_generator(position.board, tuple(rack))
+                 if not move.is_pass()]
+        moves.sort(key=lambda move: (len(move.tiles) == rack_size, move.points), reverse=True)
+        moves.append(Move())
+
+        if tt_key is not None:
+            for i, move in enumerate(moves):
+                if move.key() == tt_key:
+                    moves.insert(0, moves.pop(i))
+                    break
+        return moves
+
+    def _principal_variation(self, position, depth):
+        line = []
+        for _ in range(depth):
+            entry = self._table.get(position.hash)
+            if entry is None or entry[3] is None:
+                break
+            move = next((m for m in self._ordered_moves(position, entry[3])
+                         if m.key() == entry[3]), None)
+            if move is None:
+                break
+            position.play(move)
+            line.append(move)
+            if position.is_over():
+                break
+
+        for move in reversed(line):
+            position.undo(move)
+        return line
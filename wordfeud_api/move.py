@@ -0,0 +1,115 @@
+from .wordfeud import WordfeudException
+
+# Letter used for a blank tile on a rack
+BLANK = "?"
+
+
+#
+# A single turn: either a tile placement or a pass.
+#
+# Tiles use the same layout as the API: (x, y, letter, is_wildcard).
+# For a blank the letter is the one it stands for and is_wildcard is True.
+#
+class Move:
+
+    #
+    # @param array tiles Tiles to place, empty for a pass
+    # @param mixed words Word(s) formed, passed on to Wordfeud.place()
+    # @param int points Points scored by the move
+    #
+    def __init__(self, tiles=None, words=None, points=0):
+        self.tiles = tuple(tuple(tile) for tile in tiles) if tiles else ()
+        self.words = words
+        self.points = points
+
+    def __repr__(self):
+        if self.is_pass():
+            return "Move(pass)"
+        return "Move(%r, %s points)" % (self.words, self.points)
+
+    def __eq__(self, other):
+        return isinstance(other, Move) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def is_pass(self):
+        return not self.tiles
+
+    #
+    # Identity of the move, independent of the order its tiles were listed in
+    #
+    # @return tuple
+    #
+    def key(self):
+        return tuple(sorted(self.tiles))
+
+    #
+    # Letters this move takes from the rack
+    #
+    # @return array
+    #
+    def rack_letters(self):
+        return [BLANK if tile[3] else tile[2] for tile in self.tiles]
+
+    #
+    # Submit the move through an API client.
+    #
+    # @param Wordfeud wf Logged in API client
+    # @param int game_id
+    # @param int ruleset
+    # @return array Response of Wordfeud.place() or Wordfeud.skip_turn()
+    #
+    def play(self, wf, game_id, ruleset):
+        if self.is_pass():
+            return wf.skip_turn(game_id)
+        return wf.place(game_id, ruleset, [list(tile) for tile in self.tiles], self.words)
+
+
+#
+# Build a board from the 'tiles' list of a get_game() payload
+#
+# @param array tiles List of [x, y, letter, is_wildcard]
+# @return dict Mapping (x, y) => (letter, is_wildcard)
+#
+def board_from_tiles(tiles):
+    board = {}
+    for tile in tiles:
+        board[(tile[0], tile[1])] = (tile[2], bool(tile[3]))
+    return board
+
+
+#
+# Normalise a rack so blanks are always BLANK (an empty string is accepted too)
+#
+# @param array rack List of letters
+# @return array
+#
+def normalize_rack(rack):
+    return [letter if letter else BLANK for letter in rack]
+
+
+#
+# Sum of the letter values on a rack. Blanks are worth nothing.
+#
+# @param array rack List of letters
+# @param dict tile_values Mapping letter => value
+# @return int
+#
+def rack_value(rack, tile_values):
+    return sum(tile_values.get(letter, 0) for letter in rack if letter != BLANK)
+
+
+#
+# Find the player dict holding the rack in a get_game() payload,
+# which is always the authenticated user.
+#
+# @param array game get_game() payload
+# @return array Player dict
+# @throws WordfeudException If no rack is present
+#
+def own_player(game):
+    for player in game["players"]:
+        if "rack" in player:
+            return player
+    raise WordfeudException("no_rack")
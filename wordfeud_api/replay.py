@@ -0,0 +1,192 @@
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from .move import Move
+from .wordfeud import WordfeudException
+
+# Move types in the move history of a get_game() payload
+MoveTypeMove = "move"
+MoveTypeSwap = "swap"
+MoveTypePass = "pass"
+MoveTypeResign = "resign"
+
+
+#
+# Read-only view of the board at one ply of a replay.
+#
+# Snapshots share the replay's tile list instead of copying the board, so
+# creating one is O(1). It behaves like the board dict used elsewhere:
+# (x, y) => (letter, is_wildcard). Use dict(snapshot) for a mutable copy.
+#
+class BoardSnapshot(Mapping):
+
+    def __init__(self, replay, ply):
+        self._replay = replay
+        self.ply = ply
+        self._size = replay._tile_counts[ply]
+
+    def __getitem__(self, square):
+        placed = self._replay._placed.get(square)
+        if placed is None or placed[0] > self.ply:
+            raise KeyError(square)
+        return placed[1]
+
+    def __contains__(self, square):
+        placed = self._replay._placed.get(square)
+        return placed is not None and placed[0] <= self.ply
+
+    def __iter__(self):
+        tiles = self._replay._tiles
+        for i in range(self._size):
+            yield tiles[i]
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return "BoardSnapshot(ply=%s, tiles=%s)" % (self.ply, self._size)
+
+
+#
+# One move of a replayed game
+#
+class ReplayPly:
+
+    def __init__(self, number, player, move_type, move, points, scores):
+        # Ply number, 1 for the first move of the game
+        self.number = number
+        # Position of the player who moved
+        self.player = player
+        self.move_type = move_type
+        self.move = move
+        self.points = points
+        # Scores of all players after this move, by position
+        self.scores = scores
+
+    def __repr__(self):
+        return "ReplayPly(%s, player=%s, %s, scores=%r)" % (
+            self.number, self.player, self.move_type, self.scores)
+
+    #
+    # Letters the player took from their rack for this move. The payload
+    # does not record racks or draws, so this is all that is known of the
+    # opponent's rack at this point.
+    #
+    # @return array
+    #
+    def rack_letters(self):
+        return self.move.rack_letters()
+
+
+#
+# Replay of a game from the move history of its get_game() payload.
+#
+# The history is read once. Every board square remembers the ply its tile
+# was placed on, so the board at any ply is an O(1) BoardSnapshot rather
+# than a replay from the first move, and scores are kept per ply.
+#
+class GameReplay:
+
+    #
+    # @param array game get_game() payload including 'moves'
+    # @throws WordfeudException If the move history is missing or inconsistent
+    #
+    def __init__(self, game):
+        if "moves" not in game:
+            raise WordfeudException("no_move_history")
+
+        self.game_id = game.get("id")
+        positions = {player["id"]: player["position"] for player in game["players"]}
+        scores = [0] * len(game["players"])
+
+        # square => (ply placed, (letter, is_wildcard)), plus squares in placement order
+        self._placed = {}
+        self._tiles = []
+        self._tile_counts = [0]
+        self._scores = [tuple(scores)]
+        self.plies = []
+
+        for number, entry in enumerate(game["moves"], 1):
+            move_type = entry.get("move_type", MoveTypeMove)
+            player = positions.get(entry.get("user_id"))
+            points = entry.get("points", 0)
+
+            if move_type == MoveTypeMove:
+                move = Move(entry["move"], entry.get("main_word"), points)
+                for x, y, letter, wild in move.tiles:
+                    if (x, y) in self._placed:
+                        raise WordfeudException("invalid_move_history")
+                    self._placed[(x, y)] = (number, (letter, bool(wild)))
+                    self._tiles.append((x, y))
+            else:
+                move = Move()
+
+            if player is not None:
+                scores[player] += points
+            self._tile_counts.append(len(self._tiles))
+            self._scores.append(tuple(scores))
+            self.plies.append(ReplayPly(number, player, move_type, move, points, tuple(scores)))
+
+    def __len__(self):
+        return len(self.plies)
+
+    def __iter__(self):
+        return iter(self.plies)
+
+    #
+    # The board after a number of moves
+    #
+    # @param int ply 0 for the empty board, len(replay) for the final board
+    # @return BoardSnapshot
+    #
+    def board(self, ply):
+        self._check_ply(ply)
+        return BoardSnapshot(self, ply)
+
+    #
+    # Scores after a number of moves
+    #
+    # @param int ply 0 for the start of the game
+    # @return tuple Scores by player position
+    #
+    def scores(self, ply):
+        self._check_ply(ply)
+        return self._scores[ply]
+
+    #
+    # Iterate over (ply, board, scores), starting with the empty board
+    #
+    def snapshots(self):
+        for ply in range(len(self.plies) + 1):
+            yield ply, BoardSnapshot(self, ply), self._scores[ply]
+
+    def _check_ply(self, ply):
+        if not 0 <= ply <= len(self.plies):
+            raise IndexError("ply %s out of range" % ply)
+
+
+def _replay_game(game, func):
+    replay = GameReplay(game)
+    return func(replay) if func is not None else replay
+
+
+#
+# Replay many games in worker processes.
+#
+# Sending whole replays back to the parent is mostly pickling, so pass a
+# function to reduce each replay to what you need in the worker. It is sent
+# to the worker processes, so it has to be a module level function.
+#
+# @param iterable games get_game() payloads including 'moves', a generator works too
+# @param callable func Called with each GameReplay in the worker, None to return the replays
+# @param int workers Worker processes, None for one per CPU, 1 to run in-process
+# @param int chunksize Games sent to a worker at a time
+# @return array Results in the order of the games
+#
+def replay_games(games, func=None, workers=None, chunksize=16):
+    if workers == 1:
+        return [_replay_game(game, func) for game in games]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_replay_game, games, repeat(func), chunksize=chunksize))
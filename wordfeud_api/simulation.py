@@ -0,0 +1,237 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from .move import Move, board_from_tiles, normalize_rack, rack_value, own_player
+from .tiles import UnseenTiles, tile_values as ruleset_tile_values
+from .wordfeud import WordfeudException
+
+# Tiles on a full rack
+RACK_SIZE = 7
+
+
+#
+# Play out one simulation of a candidate move and return the spread
+# (our points minus the opponent's) it led to.
+#
+# The opponent's rack is drawn at random from the unseen tiles and the rest
+# of them form the bag. Both sides then play the highest scoring move
+# available for the given number of plies.
+#
+def _playout(state, candidate, seed):
+    board, rack, unseen, move_generator, tile_values, plies = state
+    rng = random.Random(seed)
+
+    bag = list(unseen)
+    rng.shuffle(bag)
+    racks = [list(rack), bag[:RACK_SIZE]]
+    del bag[:RACK_SIZE]
+    board = dict(board)
+
+    spread = 0
+    player = 0
+    move = candidate
+    for ply in range(plies + 1):
+        if ply:
+            moves = move_generator(board, tuple(racks[player]))
+            move = max(moves, key=lambda m: m.points, default=None) or Move()
+
+        own_rack = racks[player]
+        for tile, letter in zip(move.tiles, move.rack_letters()):
+            board[(tile[0], tile[1])] = (tile[2], bool(tile[3]))
+            own_rack.remove(letter)
+        own_rack.extend(bag[:len(move.tiles)])
+        del bag[:len(move.tiles)]
+
+        sign = 1 if player == 0 else -1
+        spread += sign * move.points
+        if not own_rack:
+            spread += sign * 2 * rack_value(racks[1 - player], tile_values)
+            break
+        player = 1 - player
+
+    return spread
+
+
+#
+# Run playouts until the seeds or the time run out.
+# The deadline is wall clock time, so it means the same in every process.
+#
+def _run_playouts(state, candidate, seeds, deadline):
+    spreads = []
+    for seed in seeds:
+        if time.time() > deadline:
+            break
+        spreads.append(_playout(state, candidate, seed))
+    return spreads
+
+
+#
+# Simulation statistics for one candidate move
+#
+class SimulationResult:
+
+    def __init__(self, move, spreads):
+        self.move = move
+        self.iterations = len(spreads)
+        self.mean_spread = sum(spreads) / len(spreads) if spreads else 0.0
+        if len(spreads) > 1:
+            variance = sum((s - self.mean_spread) ** 2 for s in spreads) / (len(spreads) - 1)
+            self.stdev = math.sqrt(variance)
+        else:
+            self.stdev = 0.0
+
+    def __repr__(self):
+        return "SimulationResult(%r, mean_spread=%.2f, iterations=%d)" % (
+            self.move, self.mean_spread, self.iterations)
+
+
+#
+# Monte Carlo simulation of candidate moves.
+#
+# Each candidate is played, then the game is played out for a few plies
+# against opponent racks sampled from the unseen tiles. Candidates are
+# ranked by the average spread they lead to.
+#
+# Playouts are split into small tasks that run on a process pool, so even
+# a single candidate uses every worker. Workers stop starting playouts at
+# the deadline, and tasks that have not started by then are cancelled.
+#
+# Playout i uses the same seed for every candidate, so all candidates face
+# the same opponent racks and draws. Each candidate is scored on the
+# playouts 0..n-1 that every candidate finished, so the same seed and n
+# always give the same result, whatever the number of workers.
+#
+# The move generator takes (board, rack) and returns Move objects, like the
+# one used by EndgameSolver. It is sent to the worker processes, so it has
+# to be a module level function.
+#
+class MonteCarloSimulator:
+
+    #
+    # @param callable move_generator Returns the moves for (board, rack)
+    # @param dict tile_values Mapping letter => value, simulate_game() defaults to the game's rule set
+    # @param int plies Plies to play out after the candidate move
+    # @param float time_budget Seconds to spend on one decision
+    # @param int max_iterations Maximum playouts per candidate
+    # @param int batch_size Playouts per task sent to a worker
+    # @param int workers Worker processes, None for one per CPU, 1 to run in-process
+    # @param int seed Base seed for the playouts
+    #
+    def __init__(self, move_generator, tile_values=None, plies=2, time_budget=5.0,
+                 max_iterations=1000, batch_size=4, workers=None, seed=0):
+        self.move_generator = move_generator
+        self.tile_values = tile_values
+        self.plies = plies
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.batch_size = batch_size
+        self.workers = workers
+        self.seed = seed
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    #
+    # Shut down the worker processes. They are started again when needed.
+    #
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    #
+    # Simulate the candidate moves for your rack in a game.
+    #
+    # @param array game get_game() payload
+    # @param array candidates Move objects to choose from
+    # @param array unseen Letters not on the board or your rack, worked out from the game by default
+    # @return array SimulationResult per candidate, best first
+    # @throws WordfeudException See simulate()
+    #
+    def simulate_game(self, game, candidates, unseen=None):
+        if unseen is None:
+            unseen = UnseenTiles.from_game(game).letters()
+        rack = normalize_rack(own_player(game)["rack"])
+        tile_values = self.tile_values or ruleset_tile_values(game["ruleset"])
+        return self.simulate(board_from_tiles(game.get("tiles", [])), rack, candidates, unseen,
+                             tile_values)
+
+    #
+    # Simulate candidate moves.
+    #
+    # @param dict board Mapping (x, y) => (letter, is_wildcard)
+    # @param array rack Letters on your rack
+    # @param array candidates Move objects to choose from
+    # @param array unseen Letters not on the board or your rack
+    # @param dict tile_values Mapping letter => value, instead of the simulator's
+    # @return array SimulationResult per candidate, best first
+    # @throws WordfeudException If no letter values are known, or the time
+    #         budget ran out before every candidate finished a playout
+    #
+    def simulate(self, board, rack, candidates, unseen, tile_values=None):
+        tile_values = tile_values or self.tile_values
+        if tile_values is None:
+            raise WordfeudException("no_tile_values")
+
+        deadline = time.time() + self.time_budget
+        state = (board, list(rack), list(unseen), self.move_generator,
+                 tile_values, self.plies)
+        seeds = [self._seed(i) for i in range(self.max_iterations)]
+
+        # Iterations first, so every candidate gets through its playouts at the same pace
+        tasks = [(index, start)
+                 for start in range(0, self.max_iterations, self.batch_size)
+                 for index in range(len(candidates))]
+        spreads = [[None] * self.max_iterations for _ in candidates]
+
+        if self.workers == 1:
+            for index, start in tasks:
+                task_seeds = seeds[start:start + self.batch_size]
+                result = _run_playouts(state, candidates[index], task_seeds, deadline)
+                spreads[index][start:start + len(result)] = result
+                if len(result) < len(task_seeds):
+                    break
+        else:
+            self._run_tasks(state, candidates, seeds, tasks, spreads, deadline)
+
+        # Only playouts every candidate finished count
+        iterations = min(((candidate_spreads + [None]).index(None) for candidate_spreads in spreads),
+                         default=0)
+        if candidates and not iterations:
+            raise WordfeudException("time_budget_too_short")
+        results = [SimulationResult(candidate, candidate_spreads[:iterations])
+                   for candidate, candidate_spreads in zip(candidates, spreads)]
+        results.sort(key=lambda result: result.mean_spread, reverse=True)
+        return results
+
+    def _run_tasks(self, state, candidates, seeds, tasks, spreads, deadline):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        futures = {}
+        for index, start in tasks:
+            task_seeds = seeds[start:start + self.batch_size]
+            future = self._executor.submit(_run_playouts, state, candidates[index],
+                                           task_seeds, deadline)
+            futures[future] = (index, start)
+
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.time()))
+        if not_done:
+            # Running tasks stop after their current playout
+            for future in not_done:
+                future.cancel()
+            wait(not_done)
+
+        for future, (index, start) in futures.items():
+            if not future.cancelled():
+                result = future.result()
+                spreads[index][start:start + len(result)] = result
+
+    def _seed(self, iteration):
+        return "%s:%s" % (self.seed, iteration)
@@ -0,0 +1,299 @@
+from .move import BLANK, normalize_rack, own_player
+from .wordfeud import Wordfeud, WordfeudException
+
+_ENGLISH = {
+    "A": (10, 1), "B": (2, 4), "C": (2, 4), "D": (5, 2), "E": (12, 1), "F": (2, 4),
+    "G": (3, 3), "H": (3, 4), "I": (9, 1), "J": (1, 10), "K": (1, 5), "L": (4, 1),
+    "M": (2, 3), "N": (6, 1), "O": (7, 1), "P": (2, 4), "Q": (1, 10), "R": (6, 1),
+    "S": (5, 1), "T": (7, 1), "U": (4, 2), "V": (2, 4), "W": (2, 4), "X": (1, 8),
+    "Y": (2, 4), "Z": (1, 10), BLANK: (2, 0),
+}
+
+#
+# Tile distributions per rule set: letter => (count, value)
+#
+TILE_SETS = {
+    Wordfeud.RuleSetAmerican: _ENGLISH,
+    Wordfeud.RuleSetNorwegian: {
+        "A": (7, 1), "B": (3, 4), "C": (1, 10), "D": (5, 1), "E": (9, 1), "F": (4, 2),
+        "G": (4, 2), "H": (3, 3), "I": (5, 1), "J": (2, 4), "K": (4, 2), "L": (5, 1),
+        "M": (3, 2), "N": (6, 1), "O": (4, 2), "P": (2, 4), "R": (6, 1), "S": (6, 1),
+        "T": (6, 1), "U": (3, 4), "V": (3, 4), "W": (1, 8), "Y": (1, 6), "Æ": (1, 6),
+        "Ø": (2, 5), "Å": (2, 4), BLANK: (2, 0),
+    },
+    Wordfeud.RuleSetDutch: {
+        "A": (7, 1), "B": (2, 4), "C": (2, 5), "D": (5, 2), "E": (18, 1), "F": (2, 4),
+        "G": (3, 3), "H": (2, 4), "I": (4, 2), "J": (2, 4), "K": (3, 3), "L": (3, 3),
+        "M": (3, 3), "N": (11, 1), "O": (6, 1), "P": (2, 4), "Q": (1, 10), "R": (5, 2),
+        "S": (5, 2), "T": (5, 2), "U": (3, 2), "V": (2, 4), "W": (2, 5), "X": (1, 8),
+        "Y": (1, 8), "Z": (2, 5), BLANK: (2, 0),
+    },
+    Wordfeud.RuleSetDanish: {
+        "A": (7, 1), "B": (4, 3), "C": (2, 8), "D": (5, 2), "E": (9, 1), "F": (3, 3),
+        "G": (3, 3), "H": (2, 4), "I": (4, 3), "J": (2, 4), "K": (4, 3), "L": (5, 2),
+        "M": (3, 4), "N": (7, 1), "O": (5, 2), "P": (2, 4), "R": (7, 1), "S": (6, 2),
+        "T": (6, 2), "U": (3, 3), "V": (3, 4), "X": (1, 8), "Y": (2, 4), "Z": (1, 8),
+        "Æ": (2, 4), "Ø": (2, 4), "Å": (2, 4), BLANK: (2, 0),
+    },
+    Wordfeud.RuleSetSwedish: {
+        "A": (9, 1), "B": (2, 4), "C": (1, 8), "D": (5, 1), "E": (8, 1), "F": (2, 3),
+        "G": (3, 2), "H": (2, 3), "I": (5, 1), "J": (1, 7), "K": (3, 2), "L": (5, 1),
+        "M": (3, 2), "N": (6, 1), "O": (6, 2), "P": (2, 4), "R": (8, 1), "S": (8, 1),
+        "T": (9, 1), "U": (3, 4), "V": (2, 3), "X": (1, 8), "Y": (1, 7), "Z": (1, 8),
+        "Ä": (2, 3), "Å": (2, 4), "Ö": (2, 4), BLANK: (2, 0),
+    },
+    Wordfeud.RuleSetEnglish: _ENGLISH,
+    Wordfeud.RuleSetSpanish: {
+        "A": (12, 1), "B": (2, 3), "C": (4, 3), "CH": (1, 5), "D": (5, 2), "E": (12, 1),
+        "F": (1, 4), "G": (2, 2), "H": (2, 4), "I": (6, 1), "J": (1, 8), "L": (4, 1),
+        "LL": (1, 8), "M": (2, 3), "N": (5, 1), "Ñ": (1, 8), "O": (9, 1), "P": (2, 3),
+        "Q": (1, 5), "R": (5, 1), "RR": (1, 8), "S": (6, 1), "T": (4, 1), "U": (5, 1),
+        "V": (1, 4), "X": (1, 8), "Y": (1, 4), "Z": (1, 10), BLANK: (2, 0),
+    },
+    Wordfeud.RuleSetFrench: {
+        "A": (9, 1), "B": (2, 3), "C": (2, 3), "D": (3, 2), "E": (15, 1), "F": (2, 4),
+        "G": (2, 2), "H": (2, 4), "I": (8, 1), "J": (1, 8), "K": (1, 10), "L": (5, 1),
+        "M": (3, 2), "N": (6, 1), "O": (6, 1), "P": (2, 3), "Q": (1, 8), "R": (6, 1),
+        "S": (6, 1), "T": (6, 1), "U": (6, 1), "V": (2, 4), "W": (1, 10), "X": (1, 10),
+        "Y": (1, 10), "Z": (1, 10), BLANK: (2, 0),
+    },
+}
+
+
+def _tile_set(ruleset):
+    try:
+        return TILE_SETS[ruleset]
+    except KeyError:
+        raise WordfeudException("invalid_ruleset")
+
+
+#
+# Number of each letter in the full tile set of a rule set
+#
+# @param int ruleset
+# @return dict Mapping letter => count
+#
+def tile_distribution(ruleset):
+    return {letter: count for letter, (count, _) in _tile_set(ruleset).items()}
+
+
+#
+# Letter scores of a rule set
+#
+# @param int ruleset
+# @return dict Mapping letter => value
+#
+def tile_values(ruleset):
+    return {letter: value for letter, (_, value) in _tile_set(ruleset).items()}
+
+
+#
+# Binomial coefficients up to the largest tile set, so draw probabilities
+# are table lookups
+#
+_MAX_TILES = max(sum(count for count, _ in tiles.values()) for tiles in TILE_SETS.values())
+
+
+def _binomial_table(size):
+    table = [[1]]
+    for n in range(1, size + 1):
+        row = [1] * (n + 1)
+        previous = table[-1]
+        for k in range(1, n):
+            row[k] = previous[k - 1] + previous[k]
+        table.append(row)
+    return table
+
+
+_BINOMIALS = _binomial_table(_MAX_TILES)
+
+
+def _choose(n, k):
+    if k < 0 or k > n:
+        return 0
+    if n <= _MAX_TILES:
+        return _BINOMIALS[n][k]
+    result = 1
+    for i in range(min(k, n - k)):
+        result = result * (n - i) // (i + 1)
+    return result
+
+
+#
+# Keeps track of the tiles you have not seen: the bag plus the opponent's
+# rack.
+#
+# Unseen tiles are the full tile set minus the tiles on the board and on
+# your rack. Board tiles are counted as they are placed and your rack is
+# replaced whenever it changes, so following a game move by move only
+# touches the tiles of that move.
+#
+class UnseenTiles:
+
+    #
+    # @param int ruleset Rule set to take the tile distribution from
+    # @param dict distribution Custom mapping letter => count, instead of a rule set
+    #
+    def __init__(self, ruleset=None, distribution=None):
+        if distribution is None:
+            distribution = tile_distribution(ruleset)
+        self.distribution = dict(distribution)
+        self.counts = dict(distribution)
+        self.total = sum(distribution.values())
+        self.rack = []
+        self._squares = set()
+        self._cache = {}
+
+    #
+    # Create a tracker for a game, from its board and your rack
+    #
+    # @param array game get_game() payload
+    # @return UnseenTiles
+    #
+    @classmethod
+    def from_game(cls, game):
+        tracker = cls(game["ruleset"])
+        tracker.update_game(game)
+        return tracker
+
+    def __len__(self):
+        return self.total
+
+    #
+    # Bring the tracker up to date with a newer get_game() payload of the
+    # same game. Only tiles on squares that were empty before are counted.
+    #
+    # @param array game get_game() payload
+    #
+    def update_game(self, game):
+        tiles = [tile for tile in game.get("tiles", []) if (tile[0], tile[1]) not in self._squares]
+        # Whoever played the new tiles, board and rack together are what we have seen
+        self.set_rack([])
+        self.place(tiles)
+        self.set_rack(own_player(game)["rack"])
+
+    #
+    # Count tiles placed on the board
+    #
+    # @param array tiles List of (x, y, letter, is_wildcard)
+    # @param boolean from_rack True if you played them, so they were already seen
+    #
+    def place(self, tiles, from_rack=False):
+        for tile in tiles:
+            square = (tile[0], tile[1])
+            if square in self._squares:
+                raise WordfeudException("square_taken")
+            self._squares.add(square)
+
+            letter = BLANK if tile[3] else tile[2]
+            if not from_rack:
+                self._take(letter)
+            elif letter in self.rack:
+                self.rack.remove(letter)
+            else:
+                raise WordfeudException("tile_not_on_rack: %s" % letter)
+
+    #
+    # Add tiles you drew from the bag to your rack
+    #
+    # @param array letters List of letters
+    #
+    def draw(self, letters):
+        for letter in normalize_rack(letters):
+            self._take(letter)
+            self.rack.append(letter)
+
+    #
+    # Replace the letters on your rack
+    #
+    # @param array rack List of letters
+    #
+    def set_rack(self, rack):
+        rack = normalize_rack(rack)
+        for letter in self.rack:
+            self._give_back(letter)
+        for letter in rack:
+            self._take(letter)
+        self.rack = rack
+
+    #
+    # Unseen letters, one entry per tile
+    #
+    # @return array
+    #
+    def letters(self):
+        return [letter for letter, count in self.counts.items() for _ in range(count)]
+
+    def count(self, letter):
+        return self.counts.get(letter, 0)
+
+    #
+    # Probability of drawing at least one of each letter, for every letter
+    #
+    # @param int draws Number of tiles drawn from the unseen tiles
+    # @return dict Mapping letter => probability
+    #
+    def letter_probabilities(self, draws):
+        key = ("letters", draws)
+        result = self._cache.get(key)
+        if result is None:
+            draws = min(draws, self.total)
+            all_draws = _choose(self.total, draws)
+            result = {}
+            for letter, count in self.counts.items():
+                if all_draws:
+                    result[letter] = 1 - _choose(self.total - count, draws) / all_draws
+                else:
+                    result[letter] = 0.0
+            self._cache[key] = result
+        return result
+
+    #
+    # Probability of drawing at least the given letters, e.g. 'ES' or ['E', 'S'].
+    #
+    # @param mixed letters Letters wanted, repeated letters are all needed
+    # @param int draws Number of tiles drawn from the unseen tiles
+    # @return float
+    #
+    def draw_probability(self, letters, draws):
+        wanted = {}
+        for letter in letters:
+            wanted[letter] = wanted.get(letter, 0) + 1
+        key = ("draw", tuple(sorted(wanted.items())), draws)
+        result = self._cache.get(key)
+        if result is None:
+            result = self._draw_probability(list(wanted.items()), min(draws, self.total))
+            self._cache[key] = result
+        return result
+
+    def _draw_probability(self, wanted, draws):
+        all_draws = _choose(self.total, draws)
+        if not all_draws:
+            return 0.0
+        others = self.total - sum(self.count(letter) for letter, _ in wanted)
+
+        # Sum over every number of copies drawn of each wanted letter
+        def ways(index, remaining):
+            if index == len(wanted):
+                return _choose(others, remaining)
+            letter, needed = wanted[index]
+            available = self.count(letter)
+            total = 0
+            for drawn in range(needed, min(available, remaining) + 1):
+                total += _choose(available, drawn) * ways(index + 1, remaining - drawn)
+            return total
+
+        return ways(0, draws) / all_draws
+
+    def _take(self, letter):
+        count = self.counts.get(letter, 0)
+        if not count:
+            raise WordfeudException("tile_not_unseen: %s" % letter)
+        self.counts[letter] = count - 1
+        self.total -= 1
+        self._cache.clear()
+
+    def _give_back(self, letter):
+        self.counts[letter] = self.counts.get(letter, 0) + 1
+        self.total += 1
+        self._cache.clear()